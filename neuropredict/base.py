@@ -9,6 +9,7 @@ from abc import abstractmethod
 from multiprocessing import Pool
 from os import getcwd, makedirs
 from os.path import abspath, exists as pexists, getsize, join as pjoin, realpath
+from tempfile import mkdtemp
 from warnings import catch_warnings, filterwarnings, simplefilter
 
 import numpy as np
@@ -69,10 +70,14 @@ class BaseWorkflow(object):
             out_dir = getcwd()
         self.out_dir = out_dir
         self._fig_out_dir = pjoin(self.out_dir, 'figures')
-        self._tmp_dump_dir = pjoin(self.out_dir, 'temp_dump')
         makedirs(self.out_dir, exist_ok=True)
         makedirs(self._fig_out_dir, exist_ok=True)
-        makedirs(self._tmp_dump_dir, exist_ok=True)
+        if cfg.quick_dump_root_dir is None:
+            self._tmp_dump_dir = pjoin(self.out_dir, 'temp_dump')
+            makedirs(self._tmp_dump_dir, exist_ok=True)
+        else:
+            # created only when dumps are written, in self._run_cv()
+            self._tmp_dump_dir = None
 
         self._parall_proc = False
         self.num_procs = num_procs
@@ -191,14 +196,30 @@ class BaseWorkflow(object):
             self._parall_proc = True
             self._checkpointing = True
 
-            print('Parallelizing the repetitions of CV with {} processes ...'
-                  ''.format(self.num_procs))
-            with Pool(processes=self.num_procs) as pool:
-                pool.map(self._single_run_cv, list(range(self.num_rep_cv)))
-        else:
-            # switching to regular sequential for loop to avoid any parallel drama
-            for rep in range(self.num_rep_cv):
-                self._single_run_cv(rep)
+        if self._tmp_dump_dir is None and (self._checkpointing or self._parall_proc):
+            # unique folder, as the root could be shared by different runs
+            self._tmp_dump_dir = mkdtemp(prefix=cfg.quick_dump_prefix,
+                                         dir=cfg.quick_dump_root_dir)
+            print('Quick dumps of CV results are written to:\n {}\n'
+                  ''.format(self._tmp_dump_dir))
+
+        try:
+            if self._parall_proc:
+                print('Parallelizing the repetitions of CV with {} processes ...'
+                      ''.format(self.num_procs))
+                with Pool(processes=self.num_procs) as pool:
+                    pool.map(self._single_run_cv, list(range(self.num_rep_cv)))
+            else:
+                # switching to regular sequential for loop to avoid parallel drama
+                for rep in range(self.num_rep_cv):
+                    self._single_run_cv(rep)
+                self.results.flush()
+        except:
+            # dumps outside the output folder would be hard to find later
+            if cfg.quick_dump_root_dir is not None and self._tmp_dump_dir is not None:
+                from shutil import rmtree
+                rmtree(self._tmp_dump_dir, ignore_errors=True)
+            raise
 
 
     def _single_run_cv(self, run_id=None):
@@ -234,6 +255,10 @@ class BaseWorkflow(object):
             self._eval_predictions(best_pipeline, test_data, test_targets,
                                    run_id, ds_id)
 
+        # messages buffered in a pool worker would be lost with its copy of results
+        if self._parall_proc:
+            self.results.flush()
+
         # dump results if checkpointing is requested
         if self._checkpointing or self._parall_proc:
             self.results.dump(self._tmp_dump_dir, run_id)
@@ -392,7 +417,8 @@ class BaseWorkflow(object):
             # cleanup
             try:
                 from shutil import rmtree
-                rmtree(self._tmp_dump_dir, ignore_errors=True)
+                if self._tmp_dump_dir is not None:
+                    rmtree(self._tmp_dump_dir, ignore_errors=True)
             except:
                 print('Error in removing temp dir - remove it yourself:\n{}'
                       ''.format(self._tmp_dump_dir))
@@ -20,7 +20,7 @@ from neuropredict.utils import (check_classifier, check_covariates,
 from neuropredict.visualize import (compare_distributions, compare_misclf_pairwise,
                                     compare_misclf_pairwise_parallel_coord_plot,
                                     confusion_matrices)
-from sklearn.metrics import confusion_matrix, roc_curve
+from sklearn.metrics import roc_curve
 from sklearn.metrics import auc as auc_sklearn
 
 
@@ -99,7 +99,9 @@ class ClassificationWorkflow(BaseWorkflow):
         """
 
         predicted_targets = pipeline.predict(test_data)
-        self.results.add(run_id, ds_id, predicted_targets, true_targets)
+        # confusion matrix order is controlled by target_set
+        self.results.add_with_confusion(run_id, ds_id, true_targets,
+                                        predicted_targets, self._target_set)
 
         if hasattr(pipeline, predict_proba_name):
             predicted_prob = pipeline.predict_proba(test_data)
@@ -113,11 +115,6 @@ class ClassificationWorkflow(BaseWorkflow):
                                      self._positive_class)
                 self.results.add_metric(run_id, ds_id, auc_metric_name, auc)
 
-        conf_mat = confusion_matrix(true_targets, predicted_targets,
-                                    labels=self._target_set)  # to control row order
-        self.results.add_diagnostics(run_id, ds_id, conf_mat,
-                                     true_targets[predicted_targets != true_targets])
-
 
     def summarize(self):
         """Simple summary of the results produced, for logging and user info"""
@@ -138,11 +135,10 @@ class ClassificationWorkflow(BaseWorkflow):
     def _compare_metric_distr(self):
         """Main perf comparion plot"""
 
-        for metric, m_data in self.results.metric_val.items():
+        for metric in self.results.metric_val:
             metric = metric.lower()
-            consolidated = np.empty((self.num_rep_cv, len(m_data)))
-            for index, ds_id in enumerate(m_data.keys()):
-                consolidated[:, index] = m_data[ds_id]
+            consolidated, _ = self.results.to_array(metric,
+                                                    self.datasets.modality_ids)
 
             fig_out_path = pjoin(self._fig_out_dir, 'compare_{}'.format(metric))
             if 'accuracy' in metric:
@@ -166,17 +162,12 @@ class ClassificationWorkflow(BaseWorkflow):
 
         # forcing a tuple to ensure the order, in compound array and in viz's
         ds_id_order = tuple(self.datasets.modality_ids)
-        num_datasets = len(ds_id_order)
         num_classes = len(self._target_set)
-        conf_mat_all = np.empty((self.num_rep_cv, num_classes, num_classes,
-                                 num_datasets))
-        for idx, ds in enumerate(ds_id_order):
-            for run in range(self.num_rep_cv):
-                conf_mat_all[run, :, :, idx] = self.results.confusion_mat[(ds, run)]
+        conf_mat_all = self.results.confusion_mat_array(ds_id_order)
 
         cm_out_fig_path = pjoin(self._fig_out_dir, 'confusion_matrix')
         confusion_matrices(conf_mat_all, self._target_set, ds_id_order,
-                           cm_out_fig_path)
+                           cm_out_fig_path, num_procs=self.num_procs)
 
         self._compare_misclf_rate(conf_mat_all, ds_id_order, num_classes)
 
@@ -153,7 +153,8 @@ results_to_save = ['_workflow_type', '_checkpointing',
 
 _common_variable_set_to_load = ['_dataset_ids',
                                'attr', 'meta',
-                               'metric_set', 'metric_val',
+                               'metric_set', '_metric_idx', '_ds_idx',
+                               '_metric_arr',
                                'num_rep', '_count',
                                'predicted_targets', 'true_targets', ]
 
@@ -162,6 +163,12 @@ clf_results_class_variables_to_load = _common_variable_set_to_load + \
 
 regr_results_class_variables_to_load = _common_variable_set_to_load + ['residuals', ]
 
+# single precision is sufficient for performance metrics, and halves the memory
+dtype_metric_values = np.float32
+
+# number of progress messages (one per run and dataset) to print at once
+results_print_batch_size = 10
+
 ### ------------------------------------------------------------------------------
 
 # CV
@@ -239,6 +246,10 @@ file_name_options = 'options_neuropredict.pkl'
 file_name_best_param_values = 'best_parameter_values.pkl'
 
 quick_dump_prefix = 'cv_results_quick_dump'
+# quick dumps are written to a temp folder within the output folder by default.
+#   Pointing this to a memory-backed filesystem (e.g. '/dev/shm' on Linux) avoids
+#   disk I/O for these transient files, although they won't survive a reboot.
+quick_dump_root_dir = None
 
 max_len_identifiers = 75
 
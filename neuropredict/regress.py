@@ -188,10 +188,9 @@ class RegressionWorkflow(BaseWorkflow):
     def _compare_metric_distrib(self):
         """Plot comparing the distributions of different metrics"""
 
-        for metric, m_data in self.results.metric_val.items():
-            consolidated = np.empty((self.num_rep_cv, len(m_data)))
-            for index, ds_id in enumerate(self.datasets.modality_ids):
-                consolidated[:, index] = m_data[ds_id]
+        for metric in self.results.metric_val:
+            consolidated, _ = self.results.to_array(metric,
+                                                    self.datasets.modality_ids)
 
             fig_out_path = pjoin(self._fig_out_dir, 'compare_{}'.format(metric))
             compare_distributions(consolidated, self.datasets.modality_ids,
@@ -42,13 +42,17 @@ class CVResults(object):
 
         if is_iterable_but_not_str(metric_set):
             self.metric_set = {func.__name__: func for func in metric_set}
-            self.metric_val = dict()
         else:
             raise ValueError('metric_set must be a list of predefined metric names')
 
-        # initializing arrays
-        for m_name in self.metric_set.keys():
-            self._init_new_metric(m_name)
+        # all metric values are stored in a single array of shape
+        #   [num_metrics, num_datasets, num_rep], with maps from names to indices
+        self._ds_idx = {ds_id: index for index, ds_id in enumerate(self._dataset_ids)}
+        self._metric_idx = {name: index
+                            for index, name in enumerate(self.metric_set.keys())}
+        self._metric_arr = np.empty((len(self._metric_idx), len(self._dataset_ids),
+                                     self.num_rep), dtype=cfg.dtype_metric_values)
+        self._metric_arr.fill(np.NaN)
 
         self._count = 0
         self.attr = dict()
@@ -59,16 +63,61 @@ class CVResults(object):
         self.predicted_targets = dict()
 
         # pretty print options
-        self._max_width_metric = max([len(mt) for mt in self.metric_set.keys()]) + 1
-        self._max_width_ds_ids = max([len(str(ds)) for ds in self._dataset_ids]) + 1
+        self._recompute_widths()
+
+        # progress messages are printed in batches
+        self._msg_buffer = list()
+        self._flush_every = cfg.results_print_batch_size
+
+
+    def _recompute_widths(self):
+        """Widths of metric names and dataset ids, for pretty printing"""
+
+        self._max_width_metric = max(map(len, self.metric_set.keys())) + 1
+        self._max_width_ds_ids = max(len(str(ds)) for ds in self._dataset_ids) + 1
 
 
     def _init_new_metric(self, name):
         """Initializes a new metric with an array for all datasets"""
 
-        if name not in self.metric_val:
-            self.metric_val[name] = {ds_id: np.full((self.num_rep,), np.NaN)
-                                     for ds_id in self._dataset_ids}
+        if name not in self._metric_idx:
+            self._metric_idx[name] = len(self._metric_idx)
+            new_slab = np.empty((1, len(self._dataset_ids), self.num_rep),
+                                dtype=cfg.dtype_metric_values)
+            new_slab.fill(np.NaN)
+            self._metric_arr = np.concatenate((self._metric_arr, new_slab), axis=0)
+
+
+    @property
+    def metric_val(self):
+        """
+        Dict of metric values, keyed by metric name and then dataset id.
+
+        The innermost arrays (of length num_rep) are views into the common array
+        holding all the metric values.
+        """
+
+        return {name: {ds_id: self._metric_arr[m_index, ds_index]
+                       for ds_id, ds_index in self._ds_idx.items()}
+                for name, m_index in self._metric_idx.items()}
+
+
+    def __setstate__(self, state):
+        """Converts results pickled with dict-based metric storage"""
+
+        metric_val = state.pop('metric_val', None)
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_msg_buffer', list())
+        self.__dict__.setdefault('_flush_every', cfg.results_print_batch_size)
+        if metric_val is not None:
+            self._ds_idx = {ds_id: index
+                            for index, ds_id in enumerate(self._dataset_ids)}
+            self._metric_idx = {name: index
+                                for index, name in enumerate(metric_val.keys())}
+            self._metric_arr = np.array([[metric_val[name][ds_id]
+                                          for ds_id in self._dataset_ids]
+                                         for name in metric_val.keys()],
+                                        dtype=cfg.dtype_metric_values)
 
 
     def add(self, run_id, dataset_id, predicted, true_targets):
@@ -82,28 +131,47 @@ class CVResults(object):
         self.true_targets[(dataset_id, run_id)] = true_targets
         self.predicted_targets[(dataset_id, run_id)] = predicted
 
+        scores = {name: score_func(true_targets, predicted)
+                  for name, score_func in self.metric_set.items()}
+        self._add_scores(run_id, dataset_id, scores)
+
+
+    def _add_scores(self, run_id, dataset_id, scores):
+        """Stores the scores (dict keyed by metric name) from a single run"""
+
         msgs = list()
         msgs.append('CV run {:<3} dataset {did:<{dlen}} :'
                     ''.format(run_id, did=dataset_id, dlen=self._max_width_ds_ids))
-        for name, score_func in self.metric_set.items():
-            score = score_func(true_targets, predicted)
-            self.metric_val[name][dataset_id][run_id] = score
+        ds_index = self._ds_idx[dataset_id]
+        for name, score in scores.items():
+            self._metric_arr[self._metric_idx[name], ds_index, run_id] = score
             msgs.append(' {:>20} {:8.3f}'.format(name, score))
 
-        # quick summary print
-        print(' '.join(msgs))
+        # quick summary print, in batches
+        self._msg_buffer.append(' '.join(msgs))
+        if len(self._msg_buffer) >= self._flush_every:
+            self.flush()
 
         # counting
         self._count += 1
 
 
+    def flush(self):
+        """Prints any buffered progress messages"""
+
+        if len(self._msg_buffer) > 0:
+            print('\n'.join(self._msg_buffer))
+            self._msg_buffer.clear()
+
+
     def add_metric(self, run_id, dataset_id, name, value):
         """Helper to add a metric directly"""
 
-        if name not in self.metric_val:
+        if name not in self._metric_idx:
             self._init_new_metric(name)
 
-        self.metric_val[name][dataset_id][run_id] = value
+        self._metric_arr[self._metric_idx[name],
+                         self._ds_idx[dataset_id], run_id] = value
 
 
     def add_attr(self, run_id, dataset_id, name, value):
@@ -131,13 +199,16 @@ class CVResults(object):
         """for FYI"""
 
         if self._count > 0:
+            # reducing over runs for all metrics and datasets at once
+            medians = np.nanmedian(self._metric_arr, axis=2)
+            stdevs = np.nanstd(self._metric_arr, axis=2, dtype=np.float64)
             summary = list()
-            for metric, mdict in self.metric_val.items():
+            for metric, m_index in self._metric_idx.items():
                 summary.append('\n{metric:<{mmw}}'
                                ''.format(metric=metric, mmw=self._max_width_metric))
-                for ds, distr in mdict.items():
-                    median = np.nanmedian(distr)
-                    SD = np.nanstd(distr)
+                for ds, ds_index in self._ds_idx.items():
+                    median = medians[m_index, ds_index]
+                    SD = stdevs[m_index, ds_index]
                     summary.append('\t{ds:>{mds}} '
                                    ' : median {median:<7.4f} SD {SD:<7.4f}'
                                    ''.format(ds=ds, median=median,
@@ -151,7 +222,7 @@ class CVResults(object):
         """Simple summary"""
 
         return '\n\nMetrics : {}\n # runs : {}, # datasets : {}\n{}' \
-               ''.format(', '.join(self.metric_val.keys()), self._count,
+               ''.format(', '.join(self._metric_idx.keys()), self._count,
                          len(self._dataset_ids), self._metric_summary())
 
 
@@ -200,29 +271,37 @@ class CVResults(object):
         """
 
         metric = metric.lower()
-        if metric not in self.metric_val:
+        if metric not in self._metric_idx:
             raise ValueError('Unrecognized metric: {}\n\tMust be one of {}'
-                             ''.format(metric, tuple(self.metric_val.keys())))
+                             ''.format(metric, tuple(self._metric_idx.keys())))
 
-        if ds_ids is None:
-            ds_ids = self._dataset_ids
-        else:
-            for did in ds_ids:
-                if did not in self._dataset_ids:
-                    raise ValueError('{} not recognized! Choose a dataset from: {}'
-                                     ''.format(did, self._dataset_ids))
+        ds_ids = self._check_ds_ids(ds_ids)
 
-        m_data = self.metric_val[metric]
-        consolidated = np.empty((self.num_rep, len(m_data)))
-        for index, ds_id in enumerate(ds_ids):
-            consolidated[:, index] = m_data[ds_id]
+        # single gather from the common array: num_datasets x num_rep --> transpose
+        ds_indices = [self._ds_idx[ds_id] for ds_id in ds_ids]
+        consolidated = self._metric_arr[self._metric_idx[metric], ds_indices, :].T
 
         return consolidated, ds_ids
 
 
+    def _check_ds_ids(self, ds_ids):
+        """Validates the given dataset ids, defaulting to all of them if None"""
+
+        if ds_ids is None:
+            return self._dataset_ids
+
+        # keys of the index map offer constant-time membership
+        unknown = set(ds_ids) - self._ds_idx.keys()
+        if len(unknown) > 0:
+            raise ValueError('{} not recognized! Choose a dataset from: {}'
+                             ''.format(tuple(unknown), self._dataset_ids))
+
+        return ds_ids
+
+
     @abstractmethod
-    def _to_save(self):
-        """Returns a list of variables to be persisted to disk"""
+    def _to_save(self, run_id):
+        """Returns a list of variables to be persisted to disk, for a given run"""
 
 
     @staticmethod
@@ -236,12 +315,67 @@ class CVResults(object):
         out_path = pjoin(out_dir, self._dump_file_name(run_id))
         if pexists(out_path):
             remove(out_path)
+
         with open(out_path, 'wb') as df:
-            pickle.dump(self._to_save(), df)
+            self.dump_to(df, run_id)
 
         print()
 
 
+    def dump_to(self, out_fid, run_id):
+        """
+        Writes the quick dump for a given run to a writable binary file object.
+
+        Besides regular files, this can be an in-memory buffer such as
+        io.BytesIO, to keep transient checkpoints off the disk. Read it back
+        with load_dump_from().
+        """
+
+        # with protocol 5 (Python 3.8+), arrays are handed over as out-of-band
+        #   buffers and written as is, avoiding copies into the pickle stream
+        buffers = list()
+        if pickle.HIGHEST_PROTOCOL >= 5:
+            payload = pickle.dumps(self._to_save(run_id), protocol=5,
+                                   buffer_callback=buffers.append)
+        else:
+            payload = pickle.dumps(self._to_save(run_id),
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+        raw_buffers = [buf.raw() for buf in buffers]
+
+        # sizes of the buffers go first, followed by buffers and the rest
+        pickle.dump([rb.nbytes for rb in raw_buffers], out_fid)
+        for rb in raw_buffers:
+            out_fid.write(rb)
+        out_fid.write(payload)
+
+
+    def _load_dump(self, dump_dir, run_id):
+        """Reads a quick dump written by self.dump()"""
+
+        with open(pjoin(dump_dir, self._dump_file_name(run_id)), 'rb') as df:
+            return self.load_dump_from(df)
+
+
+    @staticmethod
+    def load_dump_from(in_fid):
+        """Reads a quick dump written by dump_to() from a binary file object"""
+
+        buffer_sizes = pickle.load(in_fid)
+        buffers = list()
+        for size in buffer_sizes:
+            buf = bytearray(size)
+            num_read = in_fid.readinto(buf)
+            if num_read != size:
+                raise IOError('Quick dump is truncated: expected {} bytes, read {}'
+                              ''.format(size, num_read))
+            buffers.append(buf)
+
+        if len(buffers) > 0:
+            return pickle.load(in_fid, buffers=buffers)
+        else:
+            return pickle.load(in_fid)
+
+
     @abstractmethod
     def gather_dumps(self, dump_dir):
         """Gather results from various 'quick dumps' in a directory"""
@@ -273,15 +407,124 @@ class ClassifyCVResults(CVResults):
             super().__init__(metric_set=metric_set, num_rep=num_rep,
                              dataset_ids=dataset_ids)
 
-        self.confusion_mat = dict()  # confusion matrix
-        self.misclfd_samplets = dict()  # list of misclassified samplets
+            # confusion matrices: num_datasets x num_rep x num_classes x num_classes
+            #   allocated when the first one is added, as num_classes is known then
+            self.confusion_mat = None
+            # list of misclassified samplets, indexed by [dataset index][run]
+            self.misclfd_samplets = [[None, ] * self.num_rep
+                                     for _ in self._dataset_ids]
 
 
     def add_diagnostics(self, run_id, dataset_id, conf_mat, misclfd_ids):
-        """Method to save the confusion matrix from each prediction run"""
+        """
+        Method to save the confusion matrix from each prediction run
+
+        conf_mat must be a square matrix of integer counts. The number of classes
+        is fixed by the first confusion matrix added, and all subsequent ones
+        must be of the same shape.
+        """
+
+        conf_mat = np.asarray(conf_mat)
+        if conf_mat.ndim != 2 or conf_mat.shape[0] != conf_mat.shape[1]:
+            raise ValueError('Confusion matrix must be square! Given shape: {}'
+                             ''.format(conf_mat.shape))
+        if not np.issubdtype(conf_mat.dtype, np.integer):
+            raise ValueError('Confusion matrix must contain integer counts! '
+                             'Given dtype: {}'.format(conf_mat.dtype))
+
+        if self.confusion_mat is None:
+            num_classes = conf_mat.shape[0]
+            self.confusion_mat = np.zeros((len(self._dataset_ids), self.num_rep,
+                                           num_classes, num_classes),
+                                          dtype=np.int64)
+
+        elif conf_mat.shape != self.confusion_mat.shape[2:]:
+            raise ValueError('Confusion matrix shape {} does not match those added '
+                             'before: {}'.format(conf_mat.shape,
+                                                 self.confusion_mat.shape[2:]))
+
+        ds_index = self._ds_idx[dataset_id]
+        self.confusion_mat[ds_index, run_id] = conf_mat
+        self.misclfd_samplets[ds_index][run_id] = misclfd_ids
+
+
+    def confusion_mat_array(self, ds_ids=None):
+        """
+        Returns the confusion matrices from all runs for the given datasets, in
+        an array of shape [num_rep, num_classes, num_classes, num_datasets],
+        as expected by the visualization routines.
+        """
+
+        if self.confusion_mat is None:
+            raise ValueError('No confusion matrices have been added yet!')
+
+        ds_ids = self._check_ds_ids(ds_ids)
+        ds_indices = [self._ds_idx[ds_id] for ds_id in ds_ids]
+
+        return np.moveaxis(self.confusion_mat[ds_indices], 0, -1)
+
+
+    def __setstate__(self, state):
+        """Converts diagnostics pickled as dicts keyed by (dataset_id, run_id)"""
 
-        self.confusion_mat[(dataset_id, run_id)] = conf_mat
-        self.misclfd_samplets[(dataset_id, run_id)] = misclfd_ids
+        conf_mat = state.get('confusion_mat', None)
+        misclfd = state.get('misclfd_samplets', None)
+        super().__setstate__(state)
+        if isinstance(conf_mat, dict):
+            self.confusion_mat = None
+            self.misclfd_samplets = [[None, ] * self.num_rep
+                                     for _ in self._dataset_ids]
+            for (ds_id, run_id), cfmat in conf_mat.items():
+                self.add_diagnostics(run_id, ds_id, cfmat, misclfd[(ds_id, run_id)])
+
+
+    def add_diagnostics_fast(self, run_id, dataset_id, true_targets, predicted,
+                             num_classes):
+        """
+        Same as add_diagnostics(), but computing the confusion matrix directly
+        from targets coded as integers in [0, num_classes) or as booleans.
+        """
+
+        true_targets = np.asarray(true_targets)
+        predicted = np.asarray(predicted)
+        conf_mat = _fast_confusion(true_targets, predicted, num_classes)
+        self.add_diagnostics(run_id, dataset_id, conf_mat,
+                             true_targets[predicted != true_targets])
+
+
+    def add_with_confusion(self, run_id, dataset_id, true_targets, predicted,
+                           class_set):
+        """
+        Combines add() and add_diagnostics(), computing the confusion matrix only
+        once and deriving the supported metrics from it, without rescanning the
+        targets for each metric. Other metrics are computed as usual.
+
+        Rows and columns of the confusion matrix follow the order in class_set.
+        """
+
+        true_targets = np.asarray(true_targets)
+        predicted = np.asarray(predicted)
+        self.true_targets[(dataset_id, run_id)] = true_targets
+        self.predicted_targets[(dataset_id, run_id)] = predicted
+
+        conf_mat = confusion_from_labels(true_targets, predicted, class_set)
+        # index of the positive class, when binary metrics can use their defaults
+        pos_index = [index for index, cls in enumerate(class_set) if cls == 1]
+        if len(class_set) != 2 or len(pos_index) != 1:
+            pos_index = None
+        scores = dict()
+        for name, score_func in self.metric_set.items():
+            if name in metrics_from_confusion:
+                scores[name] = metrics_from_confusion[name](conf_mat)
+            elif name in binary_metrics_from_confusion and pos_index is not None:
+                scores[name] = binary_metrics_from_confusion[name](conf_mat,
+                                                                   pos_index[0])
+            else:
+                scores[name] = score_func(true_targets, predicted)
+        self._add_scores(run_id, dataset_id, scores)
+
+        self.add_diagnostics(run_id, dataset_id, conf_mat,
+                             true_targets[predicted != true_targets])
 
 
     def export(self):
@@ -305,20 +548,25 @@ class ClassifyCVResults(CVResults):
                 setattr(self, var, getattr(results, var))
 
             # dynamically computing whats needed
-            self._max_width_metric = max(
-                    [len(mt) for mt in self.metric_set.keys()]) + 1
-            self._max_width_ds_ids = max(
-                    [len(str(ds)) for ds in self._dataset_ids]) + 1
+            self._recompute_widths()
+            self._msg_buffer = list()
+            self._flush_every = cfg.results_print_batch_size
 
         return self
 
 
-    def _to_save(self):
+    def _to_save(self, run_id):
         """Returns a list of variables to be persisted to disk"""
 
+        # only diagnostics from the given run, indexed by dataset index
+        if self.confusion_mat is None:
+            conf_mat = None  # no diagnostics added so far
+        else:
+            conf_mat = self.confusion_mat[:, run_id]
+
         return [self.predicted_targets, self.true_targets, self.metric_val,
-                self.attr, self.meta,
-                self.confusion_mat, self.misclfd_samplets]
+                self.attr, self.meta, conf_mat,
+                [ds_misclfd[run_id] for ds_misclfd in self.misclfd_samplets]]
 
 
     def gather_dumps(self, dump_dir):
@@ -328,8 +576,7 @@ class ClassifyCVResults(CVResults):
 
         self._count = 0
         for run in range(self.num_rep):
-            with open(pjoin(dump_dir, self._dump_file_name(run)), 'rb') as df:
-                res = pickle.load(df)
+            res = self._load_dump(dump_dir, run)
 
             # unpacking results : order must match that returned by self._to_save()
             pred_tgts, true_tgts, metr_val, attrs, meta, conf_mat, misclfd = res
@@ -338,21 +585,145 @@ class ClassifyCVResults(CVResults):
                 self.true_targets[(ds, run)] = true_tgts[(ds, run)]
                 self.predicted_targets[(ds, run)] = pred_tgts[(ds, run)]
 
-                for m_name in self.metric_val.keys():
+                for m_name in self._metric_idx.keys():
                     self.add_metric(run, ds, m_name, metr_val[m_name][ds][run])
 
                 for at_name in attrs.keys():
                     self.add_attr(run, ds, at_name, attrs[at_name][(ds, run)])
 
-                # classify specific
-                self.add_diagnostics(run, ds, conf_mat[(ds, run)],
-                                     misclfd[(ds, run)])
+                # classify specific, if diagnostics were added for this run
+                ds_index = self._ds_idx[ds]
+                if conf_mat is not None and misclfd[ds_index] is not None:
+                    self.add_diagnostics(run, ds, conf_mat[ds_index],
+                                         misclfd[ds_index])
 
                 self._count += 1
 
         print('  Done.')
 
 
+def confusion_from_labels(true_targets, predicted, class_set):
+    """
+    Confusion matrix in the order of class_set, via a single bincount over
+    the linear indices of (true, predicted) pairs.
+    """
+
+    class_set = np.asarray(class_set)
+    num_classes = len(class_set)
+    sort_order = np.argsort(class_set)
+    sorted_classes = class_set[sort_order]
+
+    def encode(labels):
+        labels = np.asarray(labels)
+        pos = np.searchsorted(sorted_classes, labels).clip(max=num_classes - 1)
+        if not np.array_equal(sorted_classes[pos], labels):
+            raise ValueError('Some labels do not belong to the class set: {}'
+                             ''.format(tuple(class_set)))
+        return sort_order[pos]
+
+    return _fast_confusion(encode(true_targets), encode(predicted), num_classes)
+
+
+def _fast_confusion(true_codes, pred_codes, num_classes):
+    """
+    Confusion matrix for labels already coded as integers in [0, num_classes),
+    or as booleans (with False as the first class). Codes outside that range
+    raise a ValueError.
+    """
+
+    true_codes = np.asarray(true_codes)
+    pred_codes = np.asarray(pred_codes)
+    if true_codes.dtype == bool and pred_codes.dtype == bool:
+        if num_classes != 2:
+            raise ValueError('Boolean labels imply 2 classes, not {}'
+                             ''.format(num_classes))
+        # one AND and three sums are enough in the binary case
+        tp = np.count_nonzero(true_codes & pred_codes)
+        num_true = np.count_nonzero(true_codes)
+        num_pred = np.count_nonzero(pred_codes)
+        fn, fp = num_true - tp, num_pred - tp
+        tn = len(true_codes) - tp - fn - fp
+        return np.array([[tn, fp], [fn, tp]])
+
+    true_codes = true_codes.astype(np.intp)
+    pred_codes = pred_codes.astype(np.intp)
+    for codes in (true_codes, pred_codes):
+        if codes.size > 0 and (codes.min() < 0 or codes.max() >= num_classes):
+            raise ValueError('Labels must be coded as integers in [0, {}). '
+                             'Given range: [{}, {}]'.format(num_classes,
+                                                            codes.min(), codes.max()))
+
+    linear_idx = true_codes * num_classes + pred_codes
+
+    return np.bincount(linear_idx,
+                       minlength=num_classes * num_classes).reshape(num_classes,
+                                                                    num_classes)
+
+
+def _accuracy_from_confusion(conf_mat):
+    """Fraction of correct predictions"""
+
+    return np.trace(conf_mat) / conf_mat.sum()
+
+
+def _balanced_accuracy_from_confusion(conf_mat):
+    """Mean recall over classes present in the true targets"""
+
+    class_sizes = conf_mat.sum(axis=1)
+    present = class_sizes > 0
+
+    return np.mean(np.diag(conf_mat)[present] / class_sizes[present])
+
+
+def _binary_counts(conf_mat, pos_index):
+    """True positives, false positives and false negatives for one class"""
+
+    tp = conf_mat[pos_index, pos_index]
+    fp = conf_mat[:, pos_index].sum() - tp
+    fn = conf_mat[pos_index, :].sum() - tp
+
+    return tp, fp, fn
+
+
+def _ratio_or_zero(numerator, denominator):
+    """Ratio, defined to be 0.0 when denominator is zero (as in sklearn)"""
+
+    return numerator / denominator if denominator > 0 else 0.0
+
+
+def _precision_from_confusion(conf_mat, pos_index):
+    """Fraction of predicted positives that are correct"""
+
+    tp, fp, fn = _binary_counts(conf_mat, pos_index)
+    return _ratio_or_zero(tp, np.float64(tp + fp))
+
+
+def _recall_from_confusion(conf_mat, pos_index):
+    """Fraction of true positives that are predicted correctly"""
+
+    tp, fp, fn = _binary_counts(conf_mat, pos_index)
+    return _ratio_or_zero(tp, np.float64(tp + fn))
+
+
+def _f1_from_confusion(conf_mat, pos_index):
+    """Harmonic mean of precision and recall"""
+
+    tp, fp, fn = _binary_counts(conf_mat, pos_index)
+    return _ratio_or_zero(2 * tp, np.float64(2 * tp + fp + fn))
+
+
+# metrics that can be derived directly from the confusion matrix,
+#   keyed by the name of the equivalent sklearn metric (with default options)
+metrics_from_confusion = {'accuracy_score'         : _accuracy_from_confusion,
+                          'balanced_accuracy_score': _balanced_accuracy_from_confusion}
+
+# binary metrics, matching the sklearn defaults (average='binary', pos_label=1)
+#   only when there are two classes and one of them is 1
+binary_metrics_from_confusion = {'f1_score'       : _f1_from_confusion,
+                                 'precision_score': _precision_from_confusion,
+                                 'recall_score'   : _recall_from_confusion}
+
+
 class RegressCVResults(CVResults):
     """Custom CVResults class to accommodate classification-specific evaluation."""
 
@@ -384,7 +755,7 @@ class RegressCVResults(CVResults):
         self.residuals[(dataset_id, run_id)] = residuals
 
 
-    def _to_save(self):
+    def _to_save(self, run_id):
         """Returns a list of variables to be persisted to disk"""
 
         return [self.predicted_targets, self.true_targets, self.metric_val,
@@ -406,10 +777,9 @@ class RegressCVResults(CVResults):
                 setattr(self, var, getattr(results, var))
 
             # dynamically computing whats needed
-            self._max_width_metric = max(
-                    [len(mt) for mt in self.metric_set.keys()]) + 1
-            self._max_width_ds_ids = max(
-                    [len(str(ds)) for ds in self._dataset_ids]) + 1
+            self._recompute_widths()
+            self._msg_buffer = list()
+            self._flush_every = cfg.results_print_batch_size
 
         return self
 
@@ -421,8 +791,7 @@ class RegressCVResults(CVResults):
 
         self._count = 0
         for run in range(self.num_rep):
-            with open(pjoin(dump_dir, self._dump_file_name(run)), 'rb') as df:
-                res = pickle.load(df)
+            res = self._load_dump(dump_dir, run)
 
             # unpacking results : order must match that returned by self._to_save()
             pred_tgts, true_tgts, metr_val, attrs, meta, resids = res
@@ -431,7 +800,7 @@ class RegressCVResults(CVResults):
                 self.true_targets[(ds, run)] = true_tgts[(ds, run)]
                 self.predicted_targets[(ds, run)] = pred_tgts[(ds, run)]
 
-                for m_name in self.metric_val.keys():
+                for m_name in self._metric_idx.keys():
                     self.add_metric(run, ds, m_name, metr_val[m_name][ds][run])
 
                 for at_name in attrs.keys():
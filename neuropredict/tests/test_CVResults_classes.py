@@ -1,4 +1,6 @@
+import io
 import pickle
+import tempfile
 import numpy as np
 from pathlib import Path
 from os import makedirs
@@ -85,4 +87,187 @@ def test_regress():
     print()
 
 
+def _populated_results(res_class, num_rep=4, ds_ids=('ds1', 'ds2')):
+    """Results filled with random predictions, along with their diagnostics"""
+
+    rng = np.random.RandomState(42)
+    results = res_class(num_rep=num_rep, dataset_ids=list(ds_ids))
+    for run in range(num_rep):
+        for ds_id in ds_ids:
+            if res_class is ClassifyCVResults:
+                true_tgts = rng.choice(['a', 'b', 'c'], 30)
+                predicted = rng.choice(['a', 'b', 'c'], 30)
+                results.add_with_confusion(run, ds_id, true_tgts, predicted,
+                                           ('a', 'b', 'c'))
+            else:
+                true_tgts = rng.rand(30)
+                predicted = rng.rand(30)
+                results.add(run, ds_id, predicted, true_tgts)
+                results.add_diagnostics(run, ds_id, true_tgts, predicted)
+    results.flush()
+
+    return results
+
+
+def _test_same_results(res_one, res_two):
+    """Checks the metrics and diagnostics in both results are identical"""
+
+    for metric in res_one.metric_set:
+        arr_one, ds_one = res_one.to_array(metric)
+        arr_two, ds_two = res_two.to_array(metric)
+        if ds_one != ds_two or not np.array_equal(arr_one, arr_two):
+            raise ValueError('values of {} differ!'.format(metric))
+
+    if isinstance(res_one, ClassifyCVResults):
+        if not np.array_equal(res_one.confusion_mat_array(),
+                              res_two.confusion_mat_array()):
+            raise ValueError('confusion matrices differ!')
+
+
+def test_dump_to_memory():
+
+    for res_class in (ClassifyCVResults, RegressCVResults):
+        results = _populated_results(res_class)
+        for run in range(results.num_rep):
+            buffer = io.BytesIO()
+            results.dump_to(buffer, run)
+            buffer.seek(0)
+            res = results.load_dump_from(buffer)
+
+            pred_tgts, true_tgts, metr_val = res[:3]
+            for ds_id in results._dataset_ids:
+                if not np.array_equal(pred_tgts[(ds_id, run)],
+                                      results.predicted_targets[(ds_id, run)]):
+                    raise ValueError('predicted targets differ after reloading')
+                for metric in results.metric_set:
+                    if not np.array_equal(metr_val[metric][ds_id],
+                                          results.metric_val[metric][ds_id]):
+                        raise ValueError('values of {} differ after reloading'
+                                         ''.format(metric))
+
+            if res_class is ClassifyCVResults:
+                if not np.array_equal(res[5], results.confusion_mat[:, run]):
+                    raise ValueError('confusion matrices differ after reloading')
+
+        # truncated dumps e.g. from a worker killed while writing the buffers
+        buffer = io.BytesIO()
+        results.dump_to(buffer, 0)
+        buffer.seek(0)
+        pickle.load(buffer)  # skipping the sizes, to cut right after them
+        truncated = io.BytesIO(buffer.getvalue()[:buffer.tell() + 1])
+        try:
+            results.load_dump_from(truncated)
+        except IOError:
+            pass
+        else:
+            raise ValueError('truncated dump must not be read back silently!')
+
+
+def test_gather_dumps():
+
+    for res_class in (ClassifyCVResults, RegressCVResults):
+        results = _populated_results(res_class)
+        with tempfile.TemporaryDirectory() as dump_dir:
+            for run in range(results.num_rep):
+                results.dump(dump_dir, run)
+
+            gathered = res_class(num_rep=results.num_rep,
+                                 dataset_ids=results._dataset_ids)
+            gathered.gather_dumps(dump_dir)
+
+        _test_same_results(results, gathered)
+
+
+
+def test_unpickle_dict_based_results():
+    """Results pickled with the older dict-based storage must still load"""
+
+    results = _populated_results(ClassifyCVResults)
+    ds_ids, num_rep = results._dataset_ids, results.num_rep
+
+    old_state = dict(results.__dict__)
+    for var in ('_metric_arr', '_metric_idx', '_ds_idx',
+                '_msg_buffer', '_flush_every'):
+        old_state.pop(var)
+    old_state['metric_val'] = {metric: {ds_id: np.array(values)
+                                        for ds_id, values in ds_values.items()}
+                               for metric, ds_values in results.metric_val.items()}
+    old_state['confusion_mat'] = {
+        (ds_id, run): results.confusion_mat[ds_index, run]
+        for ds_index, ds_id in enumerate(ds_ids) for run in range(num_rep)}
+    old_state['misclfd_samplets'] = {
+        (ds_id, run): results.misclfd_samplets[ds_index][run]
+        for ds_index, ds_id in enumerate(ds_ids) for run in range(num_rep)}
+
+    # pickled state is the instance __dict__, which goes through __setstate__
+    old_results = ClassifyCVResults.__new__(ClassifyCVResults)
+    old_results.__dict__.update(old_state)
+    reloaded = pickle.loads(pickle.dumps(old_results))
+
+    _test_same_results(results, reloaded)
+
+
+def test_batched_printing():
+
+    batch_size = cfg.results_print_batch_size
+    results = ClassifyCVResults(num_rep=batch_size + 2, dataset_ids=['ds', ])
+    true_tgts = np.array(['a', 'b', 'a', 'b'])
+    predicted = np.array(['a', 'a', 'a', 'b'])
+
+    for run in range(batch_size - 1):
+        results.add(run, 'ds', predicted, true_tgts)
+    if len(results._msg_buffer) != batch_size - 1:
+        raise ValueError('messages must be held until the batch is full!')
+
+    results.add(batch_size - 1, 'ds', predicted, true_tgts)
+    if len(results._msg_buffer) != 0:
+        raise ValueError('messages must be printed once the batch is full!')
+
+    results.add(batch_size, 'ds', predicted, true_tgts)
+    results.flush()
+    if len(results._msg_buffer) != 0:
+        raise ValueError('flush() must print and clear all buffered messages!')
+
+
+def test_add_with_confusion_list_inputs():
+
+    results = ClassifyCVResults(num_rep=1, dataset_ids=['ds', ])
+    results.add_with_confusion(0, 'ds', ['a', 'b', 'b'], ['a', 'a', 'b'],
+                               ('a', 'b'))
+
+    if not np.array_equal(results.misclfd_samplets[0][0], ['b', ]):
+        raise ValueError('misclassified samplets are wrong for list inputs!')
+    if not np.array_equal(results.confusion_mat[0, 0], [[1, 0], [1, 1]]):
+        raise ValueError('confusion matrix is wrong for list inputs!')
+
+
+def test_invalid_confusion_matrices():
+
+    results = ClassifyCVResults(num_rep=2, dataset_ids=['ds', ])
+    try:
+        results.confusion_mat_array()
+    except ValueError:
+        pass
+    else:
+        raise ValueError('confusion matrices must not be returned before adding!')
+
+    for invalid in (np.ones((2, 3), dtype=int),  # not square
+                    np.ones((2, 2, 2), dtype=int),  # not a matrix
+                    np.ones((2, 2))):  # not integer counts
+        try:
+            results.add_diagnostics(0, 'ds', invalid, [])
+        except ValueError:
+            pass
+        else:
+            raise ValueError('invalid confusion matrix must not be accepted!')
+
+    results.add_diagnostics(0, 'ds', np.ones((2, 2), dtype=int), [])
+    try:
+        results.add_diagnostics(1, 'ds', np.ones((3, 3), dtype=int), [])
+    except ValueError:
+        pass
+    else:
+        raise ValueError('confusion matrices of different shapes must not be mixed!')
+
+
 test_classify()
@@ -10,6 +10,12 @@ if __name__ == '__main__' and __package__ is None:
     sys.path.append(parent_dir)
 
 from neuropredict.utils import balanced_accuracy
+from neuropredict.results import (ClassifyCVResults, _fast_confusion,
+                                  binary_metrics_from_confusion,
+                                  confusion_from_labels, metrics_from_confusion)
+from sklearn.metrics import (accuracy_score, balanced_accuracy_score,
+                             confusion_matrix, f1_score, precision_score,
+                             recall_score)
 
 
 def test_balanced_accuracy():
@@ -50,3 +56,113 @@ def test_balanced_accuracy():
                 ' Differ by: {:.8f}\n'
                 ''.format(expected_acc, computed_acc,
                           expected_acc - computed_acc))
+
+
+def test_metrics_from_confusion():
+    """Metrics derived from the confusion matrix must match those from sklearn"""
+
+    class_set = ('c', 'a', 'b', 'd')
+    for num_classes_present in range(1, len(class_set) + 1):
+        true_targets = np.random.choice(class_set[:num_classes_present], 50)
+        predicted = np.random.choice(class_set, 50)
+
+        conf_mat = confusion_from_labels(true_targets, predicted, class_set)
+        if not np.array_equal(conf_mat, confusion_matrix(true_targets, predicted,
+                                                         labels=class_set)):
+            raise ArithmeticError('confusion matrix does not match sklearn!')
+
+        for metric_func in (accuracy_score, balanced_accuracy_score):
+            derived = metrics_from_confusion[metric_func.__name__](conf_mat)
+            if not np.isclose(derived, metric_func(true_targets, predicted)):
+                raise ArithmeticError('{} derived from the confusion matrix does '
+                                      'not match sklearn!'
+                                      ''.format(metric_func.__name__))
+
+
+def test_fast_confusion():
+    """Confusion matrix from coded labels must match that from sklearn"""
+
+    num_classes = 3
+    int_true = np.random.randint(0, num_classes, 50)
+    int_pred = np.random.randint(0, num_classes, 50)
+    bool_true = np.random.rand(50) > 0.5
+    bool_pred = np.random.rand(50) > 0.5
+
+    for true_codes, pred_codes, num_cls in ((bool_true, bool_pred, 2),
+                                            (int_true, int_pred, num_classes),
+                                            (bool_true, int_pred % 2, 2),
+                                            (int_true % 2, bool_pred, 2)):
+        expected = confusion_matrix(true_codes.astype(int), pred_codes.astype(int),
+                                    labels=range(num_cls))
+        if not np.array_equal(_fast_confusion(true_codes, pred_codes, num_cls),
+                              expected):
+            raise ArithmeticError('fast confusion matrix does not match sklearn!')
+
+    for true_codes, pred_codes, num_cls in ((int_true, int_pred + 1, num_classes),
+                                            (int_true - 1, int_pred, num_classes),
+                                            (bool_true, bool_pred, 3)):
+        try:
+            _fast_confusion(true_codes, pred_codes, num_cls)
+        except ValueError:
+            pass
+        else:
+            raise ValueError('out of range codes must not be accepted!')
+
+
+def test_binary_metrics_from_confusion():
+    """Binary metrics derived from the confusion matrix must match sklearn"""
+
+    metric_funcs = (f1_score, precision_score, recall_score)
+    for class_set in ((0, 1), (1, 0), (2, 1)):
+        for num_classes_present in (1, 2):
+            true_targets = np.random.choice(class_set[:num_classes_present], 50)
+            negative = [cls for cls in class_set if cls != 1][0]
+            # including the edge case of no positive predictions
+            for predicted in (np.random.choice(class_set, 50),
+                              np.full(50, negative)):
+                conf_mat = confusion_from_labels(true_targets, predicted, class_set)
+                pos_index = class_set.index(1)
+                for metric_func in metric_funcs:
+                    derived = binary_metrics_from_confusion[
+                        metric_func.__name__](conf_mat, pos_index)
+                    expected = metric_func(true_targets, predicted, zero_division=0)
+                    if not np.isclose(derived, expected):
+                        raise ArithmeticError('{} derived from the confusion matrix '
+                                              'does not match sklearn!'
+                                              ''.format(metric_func.__name__))
+
+    # falling back to sklearn when there is no positive class
+    results = ClassifyCVResults(metric_set=metric_funcs, num_rep=1,
+                                dataset_ids=['ds', ])
+    true_targets = np.random.choice(['a', 'b'], 50)
+    predicted = np.random.choice(['a', 'b'], 50)
+    try:
+        results.add_with_confusion(0, 'ds', true_targets, predicted, ('a', 'b'))
+    except ValueError:
+        pass  # sklearn requires a valid pos_label, just as without the matrix
+    else:
+        raise ValueError('binary metrics must not be derived without class 1!')
+
+
+def test_add_diagnostics_fast():
+    """Diagnostics from coded labels must match those from sklearn"""
+
+    num_classes = 3
+    for true_codes, pred_codes, num_cls in (
+            (np.random.rand(50) > 0.5, np.random.rand(50) > 0.5, 2),
+            (np.random.randint(0, num_classes, 50),
+             np.random.randint(0, num_classes, 50), num_classes)):
+        fast = ClassifyCVResults(num_rep=1, dataset_ids=['ds', ])
+        fast.add_diagnostics_fast(0, 'ds', true_codes, pred_codes, num_cls)
+
+        regular = ClassifyCVResults(num_rep=1, dataset_ids=['ds', ])
+        regular.add_diagnostics(0, 'ds',
+                                confusion_matrix(true_codes, pred_codes,
+                                                 labels=np.arange(num_cls)),
+                                true_codes[pred_codes != true_codes])
+
+        if not np.array_equal(fast.confusion_mat, regular.confusion_mat):
+            raise ArithmeticError('fast confusion matrix does not match sklearn!')
+        if not np.array_equal(fast.misclfd_samplets[0][0],
+                              regular.misclfd_samplets[0][0]):
+            raise ValueError('misclassified samplets do not match!')
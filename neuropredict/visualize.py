@@ -7,15 +7,11 @@ __all__ = ['feature_importance_map', 'confusion_matrices',
 
 import itertools
 import warnings
+from multiprocessing import Pool
 from sys import version_info
 
-import matplotlib.pyplot as plt
-import numpy.matlib  # to force
 import numpy as np
 import scipy.stats
-from matplotlib import cm
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.colors import ListedColormap
 
 if version_info.major > 2:
     from neuropredict import config as cfg
@@ -67,6 +63,10 @@ def feature_importance_map(feat_imp,
 
     """
 
+    import matplotlib.pyplot as plt
+    from matplotlib import cm
+    from matplotlib.backends.backend_pdf import PdfPages
+
     num_datasets = len(feat_imp)
 
     if num_datasets > 1:
@@ -224,7 +224,8 @@ def compute_median_std_feat_imp(imp,
 
 def confusion_matrices(cfmat_array, class_labels,
                        method_names, base_output_path,
-                       cmap=cfg.CMAP_CONFMATX):
+                       cmap=cfg.CMAP_CONFMATX,
+                       num_procs=1):
     """
     Display routine for the confusion matrix.
     Entries in confusin matrix can be turned into percentages with
@@ -240,12 +241,18 @@ def confusion_matrices(cfmat_array, class_labels,
     method_names
     base_output_path
     cmap
+    num_procs : int
+        Number of processes to render the figures for different datasets in
+        parallel. Default: 1, rendering them sequentially.
 
     Returns
     -------
 
     """
 
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
     num_datasets = cfmat_array.shape[3]
     num_classes = cfmat_array.shape[1]
     if num_classes != cfmat_array.shape[2]:
@@ -253,24 +260,52 @@ def confusion_matrices(cfmat_array, class_labels,
                          "[num_repetitions, num_classes, num_classes, num_datasets]."
                          " Given shape : {}".format(cfmat_array.shape))
 
-    np.set_printoptions(2)
+    # averaging all datasets in one pass, with datasets along the first axis
+    avg_cfmat_all = mean_over_datasets(cfmat_array, num_classes)
+
+    output_paths = list()
     for dd in range(num_datasets):
         output_path = base_output_path + '_' + str(method_names[dd])
         output_path.replace(' ', '_')
+        output_paths.append(output_path)
 
-        avg_cfmat = mean_over_cv_trials(cfmat_array[:, :, :, dd], num_classes)
+    np.set_printoptions(2)
+    if num_procs > 1 and num_datasets > 1:
+        # each dataset produces an independent figure
+        args = [(avg_cfmat_all[dd], class_labels, method_names[dd],
+                 output_paths[dd], cmap) for dd in range(num_datasets)]
+        with Pool(processes=min(num_procs, num_datasets)) as pool:
+            pool.starmap(_save_single_confusion_matrix, args)
+    else:
+        # a single figure outside of pyplot, reused for all datasets
+        fig = Figure(figsize=cfg.COMMON_FIG_SIZE)
+        FigureCanvasAgg(fig)
+        for dd in range(num_datasets):
+            _save_single_confusion_matrix(avg_cfmat_all[dd], class_labels,
+                                          method_names[dd], output_paths[dd],
+                                          cmap, fig=fig)
 
-        fig, ax = plt.subplots(figsize=cfg.COMMON_FIG_SIZE)
-        vis_single_confusion_matrix(avg_cfmat,  class_labels=class_labels,
-                                    title=method_names[dd], cmap=cmap, ax=ax)
-        fig.tight_layout()
-        pp1 = PdfPages(output_path + '.pdf')
-        pp1.savefig()
-        pp1.close()
+    return
 
-    plt.close()
 
-    return
+def _save_single_confusion_matrix(avg_cfmat, class_labels, title, output_path,
+                                  cmap=cfg.CMAP_CONFMATX, fig=None):
+    """Renders a single (averaged) confusion matrix to a PDF file."""
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if fig is None:
+        fig = Figure(figsize=cfg.COMMON_FIG_SIZE)
+        FigureCanvasAgg(fig)
+    else:
+        fig.clf()  # clears the colorbar axes as well
+
+    ax = fig.add_subplot(1, 1, 1)
+    vis_single_confusion_matrix(avg_cfmat,  class_labels=class_labels,
+                                title=title, cmap=cmap, ax=ax)
+    fig.tight_layout()
+    fig.savefig(output_path + '.pdf')
 
 
 def vis_single_confusion_matrix(conf_mat,
@@ -282,6 +317,11 @@ def vis_single_confusion_matrix(conf_mat,
                                 x_label='Predicted class'):
     """Helper to plot a single CM"""
 
+    from matplotlib import cm
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import ListedColormap
+    from matplotlib.figure import Figure
+
     if not isinstance(cmap, ListedColormap):
         cmap = cm.get_cmap(cmap)
         annot_color_low_values = cmap.colors[0]
@@ -291,7 +331,11 @@ def vis_single_confusion_matrix(conf_mat,
         annot_color_high_values = 'black'
 
     if ax is None:
-        fig, ax = plt.subplots(figsize=cfg.COMMON_FIG_SIZE)
+        fig = Figure(figsize=cfg.COMMON_FIG_SIZE)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+    else:
+        fig = ax.figure
 
     num_classes = conf_mat.shape[0]
     if num_classes != conf_mat.shape[1]:
@@ -300,31 +344,28 @@ def vis_single_confusion_matrix(conf_mat,
         print('Need {} labels. Given {}'.format(num_classes, len(class_labels)))
 
     im = ax.imshow(conf_mat, interpolation='nearest', cmap=cmap)
-    plt.colorbar(im, fraction=0.046, pad=0.04)
+    fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
     tick_marks = np.arange(len(class_labels))
-    plt.xticks(tick_marks, class_labels, rotation=45)
-    plt.yticks(tick_marks, class_labels)
+    ax.set_xticks(tick_marks)
+    ax.set_xticklabels(class_labels, rotation=45)
+    ax.set_yticks(tick_marks)
+    ax.set_yticklabels(class_labels)
     left, right, bottom, top = im.get_extent()
     ax.set(xlim=(left, right), ylim=(bottom, top),
            xlabel=x_label, ylabel=y_label, title=title)
 
     max_val = conf_mat.max()
     val_25p, val_75p = max_val/4, (3*max_val)/4
-    for i, j in itertools.product(range(num_classes), range(num_classes)):
-        try:
-            if conf_mat[i, j] >= val_75p:
-                val_annot_color = annot_color_low_values
-            elif conf_mat[i, j] >= val_25p:
-                val_annot_color = 'white' #hardcoded!
-            else:
-                val_annot_color = annot_color_high_values
-        except:
-            val_annot_color = 'black'
-        annot_str = "{:.{prec}f}%".format(conf_mat[i, j], prec=cfg.PRECISION_METRICS)
-        ax.text(j, i, annot_str, color=val_annot_color,
+    # annotation colors and strings computed for all cells at once
+    annot_colors = (annot_color_low_values, 'white', # hardcoded!
+                    annot_color_high_values)
+    color_index = np.select([conf_mat >= val_75p, conf_mat >= val_25p], [0, 1], 2)
+    annot_strs = np.char.mod('%.{}f%%'.format(cfg.PRECISION_METRICS), conf_mat)
+    for (i, j), annot_str in np.ndenumerate(annot_strs):
+        ax.text(j, i, annot_str, color=annot_colors[color_index[i, j]],
                 horizontalalignment="center") # , fontsize='large')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return ax
 
@@ -335,48 +376,54 @@ def mean_over_cv_trials(conf_mat_array, num_classes):
         to ensure it is done over the right axis
         (the first one - axis=0, column 1) for all confusion matrix methods.
 
+    An optional trailing dimension for datasets is supported i.e.
+        num_rep x num_classes x num_classes [x num_datasets]
+
     """
 
     if conf_mat_array.shape[1] != num_classes or \
             conf_mat_array.shape[2] != num_classes or \
-            len(conf_mat_array.shape) != 3:
+            len(conf_mat_array.shape) not in (3, 4):
         raise ValueError('Invalid shape of confusion matrix array! '
-                         'It must be num_rep x {nc} x {nc}'.format(nc=num_classes))
+                         'It must be num_rep x {nc} x {nc} [x num_datasets]'
+                         ''.format(nc=num_classes))
 
     # can not expect nan's here; If so, its a bug somewhere else
     avg_cfmat = np.mean(conf_mat_array, axis=0)
 
-    # percentage confusion relative to class size
-    class_size_elementwise = np.transpose(np.matlib.repmat(np.sum(avg_cfmat, axis=1),
-                                                           num_classes, 1))
-    avg_cfmat_perc = np.divide(avg_cfmat, class_size_elementwise)
+    # percentage confusion relative to class size (row sums broadcast over columns)
+    class_sizes = avg_cfmat.sum(axis=1, keepdims=True)
     # making it human readable : 0-100%, with only 2 decimals
-    return np.around(100*avg_cfmat_perc, decimals=cfg.PRECISION_METRICS)
+    return np.around(100 * avg_cfmat / class_sizes, decimals=cfg.PRECISION_METRICS)
+
+
+def mean_over_datasets(cfmat_array, num_classes):
+    """
+    Averages confusion matrices over CV trials for all datasets at once,
+        returning an array of shape [num_datasets, num_classes, num_classes],
+        so that each dataset slice is contiguous.
+
+    """
+
+    avg_cfmat = mean_over_cv_trials(cfmat_array, num_classes)
+
+    return np.ascontiguousarray(np.moveaxis(avg_cfmat, -1, 0))
 
 
 def compute_pairwise_misclf(cfmat_array):
     "Merely computes the misclassification rates, for pairs of classes."
 
-    num_datasets = cfmat_array.shape[3]
     num_classes = cfmat_array.shape[1]
     if num_classes != cfmat_array.shape[2]:
         raise ValueError("Invalid dimensions of confusion matrix.\n Shape must be: "
                          "[num_repetitions, num_classes, num_classes, num_datasets]")
 
-    num_misclf_axes = num_classes * (num_classes - 1)
+    # mean confusion over CV trials
+    avg_cfmat = mean_over_datasets(cfmat_array, num_classes)
 
-    avg_cfmat = np.full([num_datasets, num_classes, num_classes], np.nan)
-    misclf_rate = np.full([num_datasets, num_misclf_axes], np.nan)
-    for dd in range(num_datasets):
-        # mean confusion over CV trials
-        avg_cfmat[dd, :, :] = mean_over_cv_trials(cfmat_array[:, :, :, dd],
-                                                  num_classes)
-
-        count = 0
-        for ii, jj in itertools.product(range(num_classes), range(num_classes)):
-            if ii != jj:
-                misclf_rate[dd, count] = avg_cfmat[dd, ii, jj]
-                count = count + 1
+    # off-diagonal entries in row-major order, to match label_misclf_axes()
+    off_diagonal = ~np.eye(num_classes, dtype=bool)
+    misclf_rate = avg_cfmat[:, off_diagonal]
 
     return avg_cfmat, misclf_rate
 
@@ -414,6 +461,10 @@ def compare_misclf_pairwise_parallel_coord_plot(cfmat_array,
 
     """
 
+    import matplotlib.pyplot as plt
+    from matplotlib import cm
+    from matplotlib.backends.backend_pdf import PdfPages
+
     num_datasets = cfmat_array.shape[3]
     num_classes = cfmat_array.shape[1]
     if num_classes != cfmat_array.shape[2]:
@@ -476,6 +527,10 @@ def compare_misclf_pairwise_barplot(cfmat_array, class_labels, method_labels,
 
     """
 
+    import matplotlib.pyplot as plt
+    from matplotlib import cm
+    from matplotlib.backends.backend_pdf import PdfPages
+
     num_datasets = cfmat_array.shape[3]
     num_classes = cfmat_array.shape[1]
     if num_classes != cfmat_array.shape[2]:
@@ -536,6 +591,9 @@ def compare_misclf_pairwise(cfmat_array, class_labels, method_labels, out_path):
 
     """
 
+    import matplotlib.pyplot as plt
+    from matplotlib import cm
+
     num_datasets = cfmat_array.shape[3]
     num_classes = cfmat_array.shape[1]
     if num_classes != cfmat_array.shape[2]:
@@ -615,8 +673,8 @@ def compute_perc_misclf_per_sample(num_times_misclfd, num_times_tested):
         perc_misclsfd[dd] = dict()
         for sid in num_times_misclfd[dd].keys():
             if num_times_tested[dd][sid] > 0:
-                perc_misclsfd[dd][sid] = np.float64(num_times_misclfd[dd][sid]) \
-                                         / np.float64(num_times_tested[dd][sid])
+                perc_misclsfd[dd][sid] = num_times_misclfd[dd][sid] \
+                                         / num_times_tested[dd][sid]
             else:
                 never_tested.append(sid)
 
@@ -632,6 +690,9 @@ def freq_hist_misclassifications(num_times_misclfd, num_times_tested, method_lab
 
     """
 
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
     num_bins = cfg.MISCLF_HIST_NUM_BINS
     count_thresh = cfg.MISCLF_PERC_THRESH
 
@@ -730,6 +791,10 @@ def compare_distributions(metric, labels, output_path, y_label='metric',
 
     """
 
+    from matplotlib import cm
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
     if not np.isfinite(metric).all():
         raise ValueError('NaN or Inf found in the input metric array!')
 
@@ -738,9 +803,11 @@ def compare_distributions(metric, labels, output_path, y_label='metric',
     if len(labels) < num_datasets:
         raise ValueError("Insufficient number of labels for {} features!"
                          "".format(num_datasets))
-    method_ticks = 1.0 + np.arange(num_datasets)
+    method_ticks = np.arange(1, num_datasets + 1)
 
-    fig, ax = plt.subplots(figsize=cfg.COMMON_FIG_SIZE)
+    fig = Figure(figsize=cfg.COMMON_FIG_SIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
     line_coll = ax.violinplot(metric, widths=cfg.violin_width,
                               bw_method=cfg.violin_bandwidth,
                               showmedians=True, showextrema=False,
@@ -767,7 +834,7 @@ def compare_distributions(metric, labels, output_path, y_label='metric',
     ax.set_ylim(lower_lim, upper_lim)
     # ----
 
-    ax.set_xlim(np.min(method_ticks) - 1, np.max(method_ticks) + 1)
+    ax.set_xlim(0, num_datasets + 1)
     ax.set_xticks(method_ticks)
     # ax.set_xticklabels(labels, rotation=45)  # 'vertical'
 
@@ -778,17 +845,17 @@ def compare_distributions(metric, labels, output_path, y_label='metric',
 
     if horiz_line_loc is not None:
         ytick_loc = np.append(ytick_loc, horiz_line_loc)
-        plt.text(0.05, horiz_line_loc, horiz_line_label)
+        ax.text(0.05, horiz_line_loc, horiz_line_label)
 
     ytick_loc = round_(ytick_loc)
     ax.set_yticks(ytick_loc)
     ax.set_yticklabels(ytick_loc)
-    plt.ylabel(y_label, fontsize=cfg.FONT_SIZE)
+    ax.set_ylabel(y_label, fontsize=cfg.FONT_SIZE)
 
-    plt.tick_params(axis='both', which='major', labelsize=cfg.FONT_SIZE)
+    ax.tick_params(axis='both', which='major', labelsize=cfg.FONT_SIZE)
 
     # numbered labels
-    numbered_labels = ['{} {}'.format(int(ix), lbl)
+    numbered_labels = ['{} {}'.format(ix, lbl)
                        for ix, lbl in zip(method_ticks, labels)]
 
     # putting legends outside the plot below.
@@ -805,8 +872,6 @@ def compare_distributions(metric, labels, output_path, y_label='metric',
 
     fig.savefig(output_path + '.pdf', bbox_extra_artists=(leg,), bbox_inches='tight')
 
-    plt.close()
-
     return
 
 
@@ -818,6 +883,8 @@ def multi_scatter_plot(y_data, x_data, fig_out_path,
                        show_hist=True):
     """Important diagnostic plot for predictive regression analysis"""
 
+    import matplotlib.pyplot as plt
+
     if show_hist:
         fig, axes = plt.subplots(nrows=1, ncols=2, sharey=True,
                                  gridspec_kw=dict(width_ratios=(4.5, 1)),